@@ -11,6 +11,9 @@ from poe_trade_lib.logging_config import ensure_logging_initialized, get_logger
 ensure_logging_initialized()
 logger = get_logger(__name__)
 
+# Detail values formatted as currency rather than printed as-is
+_NUMERIC = (int, float)
+
 
 def main() -> None:
     """
@@ -39,7 +42,7 @@ def main() -> None:
     print(f"Trade URL: {top_result.trade_url}")
     print("Details:")
     for key, value in top_result.details.items():
-        if isinstance(value, int | float):
+        if isinstance(value, _NUMERIC):
             print(f"  - {key}: {utils.format_currency(value)}")
         else:
             print(f"  - {key}: {value}")
@@ -49,7 +52,7 @@ def main() -> None:
     print("=" * 120)
 
     historical_df = db_utils.get_historical_data(
-        top_result.strategy_name, client.league
+        top_result.strategy_name, client.league, limit=10
     )
 
     if historical_df.empty:
@@ -66,11 +69,11 @@ def main() -> None:
             ["timestamp", profit_col, "risk_profile", "liquidity_score"]
         ].copy()
         history_view.rename(columns={profit_col: "Profit"}, inplace=True)
-        history_view["Profit"] = history_view["Profit"].apply(utils.format_currency)
-        history_view["liquidity_score"] = history_view["liquidity_score"].apply(
+        history_view["Profit"] = history_view["Profit"].map(utils.format_currency)
+        history_view["liquidity_score"] = history_view["liquidity_score"].map(
             lambda x: f"{x:.0%}" if pd.notnull(x) else "N/A"
         )
-        print(history_view.tail(10).to_string(index=False))
+        print(history_view.to_string(index=False))
 
 
 if __name__ == "__main__":
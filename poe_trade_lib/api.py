@@ -1,27 +1,77 @@
 # poe_trade_lib/api.py
 from __future__ import annotations
 
-import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
 from pathlib import Path
+from typing import Any
 
+import httpx
+import ijson
+import numpy as np
+import orjson
 import pandas as pd
-import requests
 
 from . import utils
 from .config import settings
 from .logging_config import (
-    ensure_logging_initialized,
     get_logger,
     log_api_request,
     log_data_acquisition,
 )
 
-# Initialize logging
-ensure_logging_initialized()
 logger = get_logger(__name__)
 
 CACHE_EXPIRATION_SECONDS = 15 * 60
+# Expired cache entries younger than this are served immediately while a
+# background refresh fetches new data
+STALE_WINDOW_SECONDS = 60 * 60
+
+# (data_cache key, poe.ninja overview endpoint, poe.ninja item type)
+DATA_SOURCES = [
+    ("Currency", "currencyoverview", "Currency"),
+    ("Tattoo", "itemoverview", "Tattoo"),
+    ("Scarab", "itemoverview", "Scarab"),
+    ("Essence", "itemoverview", "Essence"),
+    ("Gem", "itemoverview", "SkillGem"),
+]
+
+# Fields read downstream for each poe.ninja item type; everything else in the
+# payload (sparklines, modifiers, trade info, ...) is dropped while parsing
+_ITEM_FIELDS = ("name", "chaosValue", "count")
+_FIELDS_BY_TYPE: dict[str, tuple[str, ...]] = {
+    "Currency": ("currencyTypeName", "chaosEquivalent", "count"),
+    "SkillGem": (*_ITEM_FIELDS, "gemLevel", "gemQuality", "corrupted"),
+}
+# Item names repeat across variants (gems) and are matched with string ops, so
+# they are held as categoricals; whole-number fields get the narrowest int type
+_CATEGORY_FIELDS = ("name", "currencyTypeName")
+# Category labels are Arrow-backed strings (NaN for missing, as with pandas'
+# default "str" dtype) so string ops on them run in Arrow compute kernels
+_NAME_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+_INTEGER_FIELDS = ("count", "gemLevel")
+# Gem quality is missing on 0% gems, so it stays float (NaN) at 32 bits; the
+# corrupted flag is only sent when set and is stored as a plain bool
+_FLOAT32_FIELDS = ("gemQuality",)
+_FLAG_FIELDS = ("corrupted",)
+
+# Shared HTTP/2 client so the parallel fetches are multiplexed as streams over
+# a single connection to poe.ninja instead of one TLS handshake each
+_CLIENT = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+)
+
+# In-process memo of (fetch time, frame) per (league, item_type), so repeat
+# calls within the cache lifetime skip re-reading the cache file
+_MEM_CACHE: dict[tuple[str, str], tuple[float, pd.DataFrame]] = {}
+_mem_cache_lock = threading.Lock()
+
+# (league, item_type) keys with a background refresh in flight
+_refreshing: set[tuple[str, str]] = set()
+_refreshing_lock = threading.Lock()
 
 
 def get_cache_dir() -> Path:
@@ -37,144 +87,322 @@ def get_cache_dir() -> Path:
         return Path(__file__).parent.parent / "cache"
 
 
-def get_poe_ninja_data(overview_type: str, item_type: str, league: str) -> pd.DataFrame:
-    """Fetches and cleans item data, using a local file-based cache."""
-    cache_dir = get_cache_dir()
-    cache_dir.mkdir(exist_ok=True)
-    cache_file = cache_dir / f"{league}_{item_type}.json"
-
-    if cache_file.exists():
-        if time.time() - cache_file.stat().st_mtime < CACHE_EXPIRATION_SECONDS:
-            try:
-                with open(cache_file) as f:
-                    data = json.load(f)
-
-                # Validate cached data structure
-                if not isinstance(data, list):
-                    logger.warning(
-                        f"Invalid cached data structure for {item_type}, re-fetching"
-                    )
-                else:
-                    df = pd.DataFrame(data)
-                    log_data_acquisition(item_type, len(df), cache_hit=True)
-                    return df
-            except (json.JSONDecodeError, OSError) as e:
-                logger.warning(
-                    f"Error reading cache file for {item_type}: {e}, re-fetching"
-                )
+def _filter_listings(df: pd.DataFrame, item_type: str) -> pd.DataFrame:
+    """Drops blacklisted and low-liquidity rows using a single combined mask."""
+    item_blacklist = settings.api_item_blacklist
+    min_listings = settings.api_min_listings
+
+    keep = np.ones(len(df), dtype=bool)
+
+    # Currency overviews use 'currencyTypeName' instead of 'name'
+    name_field = (
+        "name"
+        if "name" in df.columns
+        else "currencyTypeName"
+        if "currencyTypeName" in df.columns
+        else None
+    )
+    if name_field:
+        keep &= ~df[name_field].isin(item_blacklist).to_numpy()
+        blacklisted_count = len(df) - int(keep.sum())
+        if blacklisted_count > 0:
+            logger.debug(
+                f"Filtered out {blacklisted_count} blacklisted items for {item_type}"
+            )
 
-    base_url = settings.get("api.base_url", "https://poe.ninja/api/data/")
-    url = f"{base_url}{overview_type}?league={league}&type={item_type}"
+    if "count" in df.columns:
+        liquid = df["count"].to_numpy() >= min_listings
+        low_liquidity_count = int((keep & ~liquid).sum())
+        keep &= liquid
+        if low_liquidity_count > 0:
+            logger.debug(
+                f"Filtered out {low_liquidity_count} low-liquidity items for {item_type}"
+            )
 
+    return df.loc[keep].reset_index(drop=True)
+
+
+def _keep_known_fields(df: pd.DataFrame, item_type: str) -> pd.DataFrame:
+    """Drops any columns not read downstream for this item type."""
+    fields = _FIELDS_BY_TYPE.get(item_type, _ITEM_FIELDS)
+    return df[[field for field in fields if field in df.columns]]
+
+
+def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Stores names as categoricals and numeric fields and flags in compact types."""
+    converted: dict[str, pd.Series] = {}
+    for field in _CATEGORY_FIELDS:
+        if field in df.columns:
+            converted[field] = df[field].astype(_NAME_DTYPE).astype("category")
+    for field in _INTEGER_FIELDS:
+        if field in df.columns and pd.api.types.is_numeric_dtype(df[field]):
+            converted[field] = pd.to_numeric(df[field], downcast="integer")
+    for field in _FLOAT32_FIELDS:
+        if field in df.columns and pd.api.types.is_numeric_dtype(df[field]):
+            converted[field] = df[field].astype(np.float32)
+    for field in _FLAG_FIELDS:
+        if field in df.columns:
+            converted[field] = df[field].eq(True)
+    return df.assign(**converted)
+
+
+def _read_cache_file(cache_file: Path, item_type: str) -> pd.DataFrame | None:
+    """Reads a cache file, returning None if it is unreadable."""
+    # Older cache files may still carry the full poe.ninja payload, so trim
+    # them to the same fields a fresh download keeps
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-
-        # Validate JSON response structure
+        if cache_file.suffix == ".parquet":
+            df = _keep_known_fields(pd.read_parquet(cache_file), item_type)
+            return _compact_dtypes(df)
+
+        # Legacy JSON cache written before the switch to Parquet
+        with open(cache_file, "rb") as f:
+            data = orjson.loads(f.read())
+        if isinstance(data, list):
+            df = _keep_known_fields(pd.DataFrame(data), item_type)
+            return _compact_dtypes(_filter_listings(df, item_type))
+        logger.warning(f"Invalid cached data structure for {item_type}, re-fetching")
+    except (OSError, ValueError) as e:
+        # ValueError covers both JSON and Arrow decoding errors
+        logger.warning(f"Error reading cache file for {item_type}: {e}, re-fetching")
+    return None
+
+
+def _write_cache_file(df: pd.DataFrame, cache_file: Path, item_type: str) -> bool:
+    """Atomically replaces the cache file so readers never see a partial write."""
+    tmp_file = cache_file.with_suffix(".parquet.tmp")
+    try:
+        # zstd packs the repetitive name columns far tighter than snappy while
+        # still decompressing faster than the disk read it saves
+        df.to_parquet(tmp_file, compression="zstd", compression_level=3, index=False)
+        tmp_file.replace(cache_file)
+        return True
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"Could not write cache file for {item_type}: {e}")
+        return False
+
+
+def _get_meta_file(cache_file: Path) -> Path:
+    """Sidecar file holding the HTTP validators for a cache file."""
+    return cache_file.with_suffix(".meta.json")
+
+
+def _conditional_headers(cache_file: Path) -> dict[str, str]:
+    """Builds If-None-Match/If-Modified-Since headers for an existing cache file."""
+    meta_file = _get_meta_file(cache_file)
+    if not cache_file.exists() or not meta_file.exists():
+        return {}
+    try:
+        with open(meta_file, "rb") as f:
+            meta = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(meta, dict):
+        return {}
+
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _write_cache_meta(cache_file: Path, response: httpx.Response) -> None:
+    """Stores the response's ETag/Last-Modified so refreshes can be conditional."""
+    meta_file = _get_meta_file(cache_file)
+    meta = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    try:
+        if any(meta.values()):
+            with open(meta_file, "wb") as f:
+                f.write(orjson.dumps(meta))
+        else:
+            meta_file.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not write cache metadata for {cache_file.name}: {e}")
+
+
+def _remember(league: str, item_type: str, df: pd.DataFrame, fetched_at: float) -> None:
+    """Stores a frame in the in-process memo, timestamped by its data's age."""
+    with _mem_cache_lock:
+        _MEM_CACHE[(league, item_type)] = (fetched_at, df)
+
+
+def _refresh_in_background(
+    overview_type: str, item_type: str, league: str, cache_file: Path
+) -> None:
+    """Re-downloads a stale cache entry on a daemon thread, once per key."""
+    key = (league, item_type)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh() -> None:
         try:
-            json_data = response.json()
-        except requests.exceptions.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response for {item_type} in {league}: {e}")
-            return pd.DataFrame()
+            _download_poe_ninja_data(overview_type, item_type, league, cache_file)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
 
-        if not isinstance(json_data, dict):
-            logger.error(
-                f"Expected JSON object for {item_type} in {league}, got {type(json_data)}"
-            )
-            return pd.DataFrame()
+    logger.debug(f"Serving stale {item_type} data while refreshing in background")
+    threading.Thread(target=refresh, daemon=True).start()
 
-        data = json_data.get("lines", [])
-        if not isinstance(data, list):
-            logger.error(
-                f"Expected 'lines' to be a list for {item_type} in {league}, got {type(data)}"
-            )
-            return pd.DataFrame()
+
+def get_poe_ninja_data(overview_type: str, item_type: str, league: str) -> pd.DataFrame:
+    """Fetches and cleans item data, using an in-memory and a file-based cache."""
+    with _mem_cache_lock:
+        entry = _MEM_CACHE.get((league, item_type))
+    if entry is not None and time.time() - entry[0] < CACHE_EXPIRATION_SECONDS:
+        log_data_acquisition(item_type, len(entry[1]), cache_hit=True)
+        return entry[1].copy(deep=False)
+
+    cache_dir = get_cache_dir()
+    cache_dir.mkdir(exist_ok=True)
+    cache_file = cache_dir / f"{league}_{item_type}.parquet"
+
+    for candidate in (cache_file, cache_file.with_suffix(".json")):
+        if not candidate.exists():
+            continue
+        cache_mtime = candidate.stat().st_mtime
+        cache_age = time.time() - cache_mtime
+        if cache_age >= STALE_WINDOW_SECONDS:
+            continue
+        cached_df = _read_cache_file(candidate, item_type)
+        if cached_df is None:
+            continue
+        if cache_age >= CACHE_EXPIRATION_SECONDS:
+            _refresh_in_background(overview_type, item_type, league, cache_file)
+        else:
+            _remember(league, item_type, cached_df, cache_mtime)
+        log_data_acquisition(item_type, len(cached_df), cache_hit=True)
+        return cached_df
+
+    return _download_poe_ninja_data(overview_type, item_type, league, cache_file)
+
+
+def _download_poe_ninja_data(
+    overview_type: str, item_type: str, league: str, cache_file: Path
+) -> pd.DataFrame:
+    """Downloads and cleans item data from poe.ninja and writes it to the cache."""
+    url = f"{settings.api_base_url}{overview_type}?league={league}&type={item_type}"
+
+    try:
+        timeout = settings.get("api.request_timeout_seconds", 30)
+        headers = _conditional_headers(cache_file)
+        with _CLIENT.stream("GET", url, headers=headers, timeout=timeout) as response:
+            # httpx treats 3xx as an error, so the 304 is handled first
+            if response.status_code == 304:
+                log_api_request(url, response.status_code)
+                cached_df = _read_cache_file(cache_file, item_type)
+                if cached_df is not None:
+                    # Unchanged upstream, so the cached copy is fresh again
+                    cache_file.touch()
+                    _remember(league, item_type, cached_df, time.time())
+                    log_data_acquisition(item_type, len(cached_df), cache_hit=True)
+                    return cached_df
+                # The cache we validated against is unreadable; fetch it in full
+                _get_meta_file(cache_file).unlink(missing_ok=True)
+                return _download_poe_ninja_data(
+                    overview_type, item_type, league, cache_file
+                )
+
+            response.raise_for_status()
+
+            # Push the 'lines' array through ijson chunk by chunk so the raw
+            # payload is never held in memory as a whole, collecting one list
+            # per field
+            fields = _FIELDS_BY_TYPE.get(item_type, _ITEM_FIELDS)
+            columns: dict[str, list[Any]] = {field: [] for field in fields}
+            total_count = 0
+            invalid_count = 0
+            items = ijson.sendable_list()
+            parser = ijson.items_coro(items, "lines.item", use_float=True)
+            try:
+                for chunk in chain(response.iter_bytes(), [None]):
+                    if chunk is not None:
+                        parser.send(chunk)
+                    else:
+                        # Flushes whatever the parser still holds back
+                        parser.close()
+                    for item in items:
+                        total_count += 1
+                        if not isinstance(item, dict):
+                            logger.debug(
+                                f"Skipping non-dict item in {item_type} data: "
+                                f"{type(item)}"
+                            )
+                            invalid_count += 1
+                            continue
+                        for field, values in columns.items():
+                            values.append(item.get(field))
+                    del items[:]
+            except ijson.JSONError as e:
+                logger.error(f"Invalid JSON response for {item_type} in {league}: {e}")
+                return pd.DataFrame()
 
         log_api_request(url, response.status_code)
 
-        if not data:
+        if not total_count:
             logger.warning(f"No data returned for {item_type} in {league}")
             return pd.DataFrame()
 
-        # Validate data items structure
-        valid_data = []
-        for item in data:
-            if not isinstance(item, dict):
-                logger.debug(
-                    f"Skipping non-dict item in {item_type} data: {type(item)}"
-                )
-                continue
-            valid_data.append(item)
-
-        if len(valid_data) < len(data):
+        if invalid_count > 0:
             logger.warning(
-                f"Filtered out {len(data) - len(valid_data)} invalid items from {item_type} data"
+                f"Filtered out {invalid_count} invalid items from {item_type} data"
             )
 
-        with open(cache_file, "w") as f:
-            json.dump(valid_data, f)
-
-        df = pd.DataFrame(valid_data)
-        item_blacklist = settings.get("api.item_blacklist", [])
-        min_listings = settings.get("api.minimum_listings", 10)
-
-        # Check if 'name' column exists, otherwise use alternative field
-        name_field = (
-            "name"
-            if "name" in df.columns
-            else "currencyTypeName"
-            if "currencyTypeName" in df.columns
-            else None
+        # Fields missing from every item are left out rather than all-null
+        df = pd.DataFrame(
+            {
+                field: values
+                for field, values in columns.items()
+                if any(value is not None for value in values)
+            }
         )
-
-        if name_field:
-            blacklisted_count = len(df[df[name_field].isin(item_blacklist)])
-            df = df[~df[name_field].isin(item_blacklist)]
-            if blacklisted_count > 0:
-                logger.debug(
-                    f"Filtered out {blacklisted_count} blacklisted items for {item_type}"
-                )
-
-        if "count" in df.columns:
-            low_liquidity_count = len(df[df["count"] < min_listings])
-            df = df[df["count"] >= min_listings]
-            if low_liquidity_count > 0:
-                logger.debug(
-                    f"Filtered out {low_liquidity_count} low-liquidity items for {item_type}"
-                )
+        df = _compact_dtypes(_filter_listings(df, item_type))
+        if _write_cache_file(df, cache_file, item_type):
+            _write_cache_meta(cache_file, response)
+        _remember(league, item_type, df, time.time())
 
         log_data_acquisition(item_type, len(df), cache_hit=False)
         return df
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         log_api_request(url, error=str(e))
         return pd.DataFrame()
 
 
-def fetch_all_data(league: str) -> dict[str, pd.DataFrame]:
+def fetch_all_data(league: str) -> dict[str, Any]:
     """Fetches all required data types and updates global divine price."""
     logger.info(f"Starting data acquisition for league: {league}")
 
-    data_cache = {
-        "Currency": get_poe_ninja_data("currencyoverview", "Currency", league),
-        "Tattoo": get_poe_ninja_data("itemoverview", "Tattoo", league),
-        "Scarab": get_poe_ninja_data("itemoverview", "Scarab", league),
-        "Essence": get_poe_ninja_data("itemoverview", "Essence", league),
-        "Gem": get_poe_ninja_data("itemoverview", "SkillGem", league),
-    }
+    data_cache: dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=len(DATA_SOURCES)) as executor:
+        futures = {
+            executor.submit(get_poe_ninja_data, overview_type, item_type, league): key
+            for key, overview_type, item_type in DATA_SOURCES
+        }
+        for future in as_completed(futures):
+            data_cache[futures[future]] = future.result()
 
     total_records = sum(len(df) for df in data_cache.values())
     logger.info(f"Data acquisition complete - {total_records} total records retrieved")
 
-    if not data_cache["Currency"].empty:
+    # Currency prices are looked up by name, so index them once for all readers
+    currency_df = data_cache["Currency"]
+    price_map: dict[str, float] = {}
+    if not currency_df.empty:
         try:
-            div_price = data_cache["Currency"][
-                data_cache["Currency"]["currencyTypeName"] == "Divine Orb"
-            ]["chaosEquivalent"].iloc[0]
-            utils.DIVINE_TO_CHAOS = div_price
+            price_map = utils.build_currency_price_map(currency_df)
+            utils.DIVINE_TO_CHAOS = price_map["Divine Orb"]
             logger.info(
                 f"Live rates updated: 1 Divine Orb = {utils.DIVINE_TO_CHAOS:.0f} Chaos"
             )
-        except (IndexError, TypeError):
+        except (KeyError, TypeError):
             logger.warning("Could not update Divine Orb price. Using default value.")
+    data_cache["CurrencyPriceMap"] = price_map
 
     return data_cache
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from . import api, core, utils
@@ -10,11 +11,43 @@ from .config import settings
 from .logging_config import ensure_logging_initialized, get_logger
 from .models import AnalysisResult
 
-# Initialize logging
-ensure_logging_initialized()
 logger = get_logger(__name__)
 
 
+def _to_results_array(results: list[AnalysisResult]) -> np.ndarray:
+    """Packs the summary fields of each result into one structured array."""
+    text_width = max(len(r.strategy_name) for r in results)
+    risk_width = max(len(r.risk_profile) for r in results)
+    dtype = np.dtype(
+        [
+            ("strategy", f"U{text_width}"),
+            ("liquidity", "f8"),
+            ("input_cost", "f8"),
+            ("profit_per_flip", "f8"),
+            ("profit_per_hour_est", "f8"),
+            ("profit_with_corruption_ev", "f8"),
+            ("long_term", "?"),
+            ("risk_profile", f"U{risk_width}"),
+        ]
+    )
+    return np.array(
+        [
+            (
+                r.strategy_name,
+                np.nan if r.liquidity_score is None else r.liquidity_score,
+                r.input_cost,
+                r.profit_per_flip,
+                r.profit_per_hour_est,
+                r.profit_with_corruption_ev or 0,
+                r.long_term,
+                r.risk_profile,
+            )
+            for r in results
+        ],
+        dtype=dtype,
+    )
+
+
 class PoeAnalysisClient:
     """
     A client to fetch market data and run trading strategy analyses.
@@ -22,9 +55,14 @@ class PoeAnalysisClient:
     """
 
     def __init__(self, league: str | None = None) -> None:
+        ensure_logging_initialized()
         self.league = league or settings.get("default_league", "Standard")
         self.data_cache: dict[str, Any] | None = None
         self.results: list[AnalysisResult] | None = None
+        # (id of the results list it was built from, summary DataFrame)
+        self._summary_df_cache: tuple[int, pd.DataFrame] | None = None
+        # (id of the results list it was built from, structured results array)
+        self._results_array: tuple[int, np.ndarray] | None = None
         logger.info(f"PoeAnalysisClient initialized for league: '{self.league}'")
 
     def fetch_data(self) -> None:
@@ -43,7 +81,10 @@ class PoeAnalysisClient:
         assert (
             self.data_cache is not None
         )  # After fetch_data(), data_cache should not be None
+        self._summary_df_cache = None
         self.results = core.run_all_analyses(self.data_cache, self.league)
+        if self.results:
+            self._results_array = (id(self.results), _to_results_array(self.results))
         logger.info(
             f"Analysis complete - {len(self.results)} profitable strategies found"
         )
@@ -58,33 +99,67 @@ class PoeAnalysisClient:
             logger.warning("Analysis not run. Call run_analysis() first.")
             return pd.DataFrame()
 
-        results_dict_list = []
-        for r in self.results:
-            res_dict = {
-                "Strategy": r.strategy_name,
-                "Liquidity": f"{r.liquidity_score:.0%}"
-                if r.liquidity_score is not None
-                else "N/A",
-                "Input Cost": utils.format_currency(r.input_cost),
-                "Risk Profile": r.risk_profile,
+        if self._summary_df_cache and self._summary_df_cache[0] == id(self.results):
+            return self._summary_df_cache[1].copy()
+
+        if self._results_array and self._results_array[0] == id(self.results):
+            arr = self._results_array[1]
+        else:
+            arr = _to_results_array(self.results)
+            self._results_array = (id(self.results), arr)
+
+        long_term = arr["long_term"]
+        # Profit columns appear in the order of the first result's kind
+        first_is_long_term = bool(long_term[0])
+        # Rank by hourly profit when there are flips, else by corruption EV;
+        # rows without the ranking column sort last
+        if long_term.all():
+            sort_key = arr["profit_with_corruption_ev"]
+        else:
+            sort_key = np.where(long_term, -np.inf, arr["profit_per_hour_est"])
+        arr = arr[np.argsort(-sort_key, kind="stable")]
+        long_term = arr["long_term"]
+
+        liquidity = arr["liquidity"]
+        columns: dict[str, Any] = {
+            "Strategy": arr["strategy"],
+            "Liquidity": np.where(
+                np.isnan(liquidity),
+                "N/A",
+                np.char.add(np.char.mod("%.0f", liquidity * 100), "%"),
+            ),
+            "Input Cost": utils.format_currency_array(arr["input_cost"]),
+            "Risk Profile": arr["risk_profile"],
+        }
+        long_term_columns: dict[str, Any] = {}
+        if long_term.any():
+            long_term_columns = {
+                "Profit (Level)": np.where(
+                    long_term, utils.format_currency_array(arr["profit_per_flip"]), ""
+                ),
+                "Profit w/ EV": np.where(
+                    long_term,
+                    utils.format_currency_array(arr["profit_with_corruption_ev"]),
+                    "",
+                ),
             }
-            if r.long_term:
-                res_dict["Profit (Level)"] = utils.format_currency(r.profit_per_flip)
-                res_dict["Profit w/ EV"] = utils.format_currency(
-                    r.profit_with_corruption_ev or 0
-                )
-            else:
-                res_dict["Profit/Flip"] = utils.format_currency(r.profit_per_flip)
-                res_dict["Profit/Hour (Est.)"] = utils.format_currency(
-                    r.profit_per_hour_est
-                )
-            results_dict_list.append(res_dict)
-
-        summary_df = pd.DataFrame(results_dict_list)
-        sort_key = (
-            "Profit/Hour (Est.)"
-            if "Profit/Hour (Est.)" in summary_df.columns
-            else "Profit w/ EV"
-        )
-        summary_df = summary_df.sort_values(by=sort_key, ascending=False).fillna("")
-        return summary_df
+        flip_columns: dict[str, Any] = {}
+        if not long_term.all():
+            flip_columns = {
+                "Profit/Flip": np.where(
+                    long_term, "", utils.format_currency_array(arr["profit_per_flip"])
+                ),
+                "Profit/Hour (Est.)": np.where(
+                    long_term,
+                    "",
+                    utils.format_currency_array(arr["profit_per_hour_est"]),
+                ),
+            }
+        if first_is_long_term:
+            columns |= long_term_columns | flip_columns
+        else:
+            columns |= flip_columns | long_term_columns
+
+        summary_df = pd.DataFrame(columns)
+        self._summary_df_cache = (id(self.results), summary_df)
+        return summary_df.copy()
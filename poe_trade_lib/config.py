@@ -12,6 +12,35 @@ class _Config:
 
     def __init__(self) -> None:
         self._config = self._load_config()
+        # Resolved values keyed by their dot-separated path
+        self._resolved: dict[str, Any] = {}
+
+        # Pre-resolved settings read on the data acquisition hot path
+        self.api_base_url: str = self.get("api.base_url", "https://poe.ninja/api/data/")
+        self.api_min_listings: int = self.get("api.minimum_listings", 10)
+        self.api_item_blacklist: frozenset[str] = frozenset(
+            self.get("api.item_blacklist", [])
+        )
+        self.api_trade_url_base: str = self.get(
+            "api.trade_url_base", "https://www.pathofexile.com/trade/exchange/"
+        )
+        # ...and by the strategies on every analysis run
+        self.analysis_flips_per_hour: int = self.get(
+            "analysis.assumed_flips_per_hour", 120
+        )
+        self.analysis_price_tolerance: float = self.get(
+            "analysis.shopping_list_price_tolerance_chaos", 2.0
+        )
+        self.analysis_num_jackpots: int = self.get(
+            "analysis.num_jackpots_to_display", 5
+        )
+        # (profile, threshold) pairs, ascending by threshold
+        self.analysis_risk_thresholds: tuple[tuple[str, float], ...] = tuple(
+            sorted(
+                self.get("analysis.profit_volatility_risk_thresholds", {}).items(),
+                key=lambda item: item[1],
+            )
+        )
 
     def _load_config(self) -> dict[str, Any]:
         """Loads configuration from config.yaml in the project root."""
@@ -38,11 +67,15 @@ class _Config:
         Retrieves a config value using a dot-separated path.
         Example: settings.get('api.base_url')
         """
+        if key_path in self._resolved:
+            return self._resolved[key_path]
+
         keys = key_path.split(".")
         value = self._config
         try:
             for key in keys:
                 value = value[key]
+            self._resolved[key_path] = value
             return value
         except (KeyError, TypeError):
             if default is not None:
@@ -1,55 +1,140 @@
 # poe_trade_lib/core.py
 from __future__ import annotations
 
-import inspect
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from typing import Any
 
+import numpy as np
+import pandas as pd
+
 from . import strategies
 from .logging_config import (
-    ensure_logging_initialized,
     get_logger,
     log_strategy_execution,
 )
 from .models import AnalysisResult
 from .strategies.base_strategy import BaseStrategy
 
-# Initialize logging
-ensure_logging_initialized()
 logger = get_logger(__name__)
 
+# Strategies are pure functions of (data, league), so their results are kept
+# for the most recent inputs, keyed by (strategy class, league, fingerprint)
+_RESULT_CACHE_SIZE = 16
+_result_cache: OrderedDict[tuple[Any, ...], list[AnalysisResult]] = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+_RANKING_DTYPE = np.dtype(
+    [("per_hour", "f8"), ("long_term", "?"), ("ev", "f8"), ("flip", "f8")]
+)
+
+# Strategies are independent and spend most of their time in pandas/NumPy
+# kernels that release the GIL, so they run side by side. The pool is shared
+# across runs; its threads are only started on first use.
+_STRATEGY_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(8, len(strategies.STRATEGIES), os.cpu_count() or 1),
+    thread_name_prefix="strategy",
+)
+
+
+def _fingerprint(data_cache: dict[str, Any]) -> tuple[Any, ...] | None:
+    """Content hash of every DataFrame in the data cache, or None if unhashable."""
+    try:
+        return tuple(
+            (
+                key,
+                tuple(df.columns),
+                len(df),
+                int(pd.util.hash_pandas_object(df, index=False).sum()),
+            )
+            for key, df in sorted(data_cache.items(), key=itemgetter(0))
+            if isinstance(df, pd.DataFrame)
+        )
+    except TypeError:
+        return None
+
+
+def _run_strategy(
+    strategy_class: type[BaseStrategy],
+    data_cache: dict[str, Any],
+    league: str,
+    fingerprint: tuple[Any, ...] | None = None,
+) -> list[AnalysisResult]:
+    """Runs a single strategy, logging and swallowing any error it raises."""
+    cache_key = (strategy_class, league, fingerprint)
+    if fingerprint is not None:
+        with _result_cache_lock:
+            cached = _result_cache.get(cache_key)
+            if cached is not None:
+                _result_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.debug(f"Reusing cached results for {strategy_class.__name__}")
+            return list(cached)
+
+    strategy_instance = strategy_class()
+    try:
+        logger.info(f"Running strategy: {strategy_instance.name}")
+        results = strategy_instance.analyze(data_cache, league)
+        if fingerprint is not None:
+            with _result_cache_lock:
+                _result_cache[cache_key] = list(results or [])
+                if len(_result_cache) > _RESULT_CACHE_SIZE:
+                    _result_cache.popitem(last=False)
+        if results:
+            log_strategy_execution(strategy_instance.name, len(results))
+            return results
+        logger.debug(
+            f"Strategy '{strategy_instance.name}' found no profitable opportunities"
+        )
+    except Exception as e:
+        log_strategy_execution(strategy_instance.name, 0, error=str(e))
+    return []
+
 
 def run_all_analyses(data_cache: dict[str, Any], league: str) -> list[AnalysisResult]:
     """
-    Dynamically discovers and runs all implemented strategies.
+    Runs every strategy registered in strategies.STRATEGIES.
 
     Returns a sorted list of all profitable AnalysisResult objects.
     """
     all_results = []
+    fingerprint = _fingerprint(data_cache)
 
-    for _name, obj in inspect.getmembers(strategies):
-        if (
-            inspect.isclass(obj)
-            and issubclass(obj, BaseStrategy)
-            and obj is not BaseStrategy
-        ):
-            try:
-                strategy_instance = obj()
-                logger.info(f"Running strategy: {strategy_instance.name}")
-                results = strategy_instance.analyze(data_cache, league)
-                if results:
-                    all_results.extend(results)
-                    log_strategy_execution(strategy_instance.name, len(results))
-                else:
-                    logger.debug(
-                        f"Strategy '{strategy_instance.name}' found no profitable opportunities"
-                    )
-            except Exception as e:
-                log_strategy_execution(strategy_instance.name, 0, error=str(e))
-
-    all_results.sort(
-        key=lambda r: r.profit_per_hour_est
-        if not r.long_term
-        else r.profit_with_corruption_ev or r.profit_per_flip,
-        reverse=True,
+    # Results are collected in registry order, so ranking ties stay stable
+    for results in _STRATEGY_EXECUTOR.map(
+        lambda strategy_class: _run_strategy(
+            strategy_class, data_cache, league, fingerprint
+        ),
+        strategies.STRATEGIES,
+    ):
+        all_results.extend(results)
+
+    if not all_results:
+        return []
+
+    # Pull the ranking inputs out in one pass, then rank with a single argsort.
+    # Long-term results rank by corruption EV, falling back to the recipe profit
+    # when the EV is missing or zero; flips rank by hourly profit.
+    ranking = np.fromiter(
+        (
+            (
+                r.profit_per_hour_est,
+                r.long_term,
+                r.profit_with_corruption_ev or np.nan,
+                r.profit_per_flip,
+            )
+            for r in all_results
+        ),
+        dtype=_RANKING_DTYPE,
+        count=len(all_results),
+    )
+    keys = np.where(
+        ranking["long_term"],
+        np.where(np.isnan(ranking["ev"]), ranking["flip"], ranking["ev"]),
+        ranking["per_hour"],
     )
-    return all_results
+    order = np.argsort(-keys, kind="stable")
+    return [all_results[i] for i in order]
@@ -1,7 +1,9 @@
 # poe_trade_lib/db_utils.py
 from __future__ import annotations
 
+import atexit
 import sqlite3
+import threading
 import time
 from pathlib import Path
 
@@ -9,16 +11,28 @@ import pandas as pd
 
 from .config import settings
 from .logging_config import (
-    ensure_logging_initialized,
     get_logger,
     log_database_operation,
 )
 from .models import AnalysisResult
 
-# Initialize logging
-ensure_logging_initialized()
 logger = get_logger(__name__)
 
+# Shared connection reused across calls, reopened if the database path changes.
+# The lock also serializes write transactions on it across threads.
+_conn: sqlite3.Connection | None = None
+_conn_path: Path | None = None
+_conn_lock = threading.RLock()
+
+# Kept as one constant so the connection's statement cache reuses the prepared
+# INSERT across calls
+_INSERT_RESULT_SQL = """
+INSERT OR IGNORE INTO trade_results (
+    timestamp, league, strategy_name, profit_per_flip, profit_per_hour_est,
+    profit_with_corruption_ev, risk_profile, liquidity_score, long_term
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 def get_database_path() -> Path:
     """Get the database path from configuration, with fallback to default location."""
@@ -33,14 +47,51 @@ def get_database_path() -> Path:
         return Path(__file__).parent.parent.parent / "data" / "historical_trades.db"
 
 
+def get_conn() -> sqlite3.Connection:
+    """Returns the shared connection to the configured database, opening it once."""
+    global _conn, _conn_path
+    db_path = get_database_path()
+    with _conn_lock:
+        if _conn is None or _conn_path != db_path:
+            if _conn is not None:
+                _conn.close()
+            # Autocommit mode; writers open their own transactions explicitly
+            _conn = sqlite3.connect(
+                db_path, check_same_thread=False, isolation_level=None
+            )
+            _conn_path = db_path
+            # WAL lets readers (the dashboard) proceed during a write, and
+            # NORMAL sync is durable enough for a history table appended to
+            # once an hour
+            _conn.execute("PRAGMA journal_mode=WAL")
+            _conn.execute("PRAGMA synchronous=NORMAL")
+            _conn.execute("PRAGMA temp_store=MEMORY")
+            _conn.execute("PRAGMA cache_size=-65536")
+            # Serve history reads from a memory map instead of read() calls
+            _conn.execute("PRAGMA mmap_size=268435456")
+        return _conn
+
+
+def _close_conn() -> None:
+    """Closes the shared connection at interpreter exit."""
+    global _conn, _conn_path
+    with _conn_lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+            _conn_path = None
+
+
+atexit.register(_close_conn)
+
+
 def initialize_database() -> None:
     """Creates the database and the results table if they don't exist."""
     db_path = get_database_path()
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
 
-    cursor.execute("""
+    conn = get_conn()
+    conn.execute("""
     CREATE TABLE IF NOT EXISTS trade_results (
         timestamp INTEGER NOT NULL,
         league TEXT NOT NULL,
@@ -54,8 +105,11 @@ def initialize_database() -> None:
         PRIMARY KEY (timestamp, strategy_name, league)
     )
     """)
-    conn.commit()
-    conn.close()
+    # Serves the per-strategy history lookups in timestamp order without a sort
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_trade_strat_league_ts
+    ON trade_results (strategy_name, league, timestamp)
+    """)
 
 
 def log_results_to_db(results: list[AnalysisResult], league: str) -> None:
@@ -64,43 +118,36 @@ def log_results_to_db(results: list[AnalysisResult], league: str) -> None:
         logger.info("No results to log to database")
         return
 
-    conn = sqlite3.connect(get_database_path())
-    cursor = conn.cursor()
-
     timestamp = int(time.time())
-
-    logged_count = 0
-    duplicate_count = 0
-    for r in results:
+    rows = [
+        (
+            timestamp,
+            league,
+            r.strategy_name,
+            r.profit_per_flip,
+            r.profit_per_hour_est,
+            r.profit_with_corruption_ev,
+            r.risk_profile,
+            r.liquidity_score,
+            1 if r.long_term else 0,
+        )
+        for r in results
+    ]
+
+    with _conn_lock:
+        conn = get_conn()
+        changes_before = conn.total_changes
+        # One statement and one transaction for the whole batch; rows that
+        # collide with the primary key are skipped instead of raising
+        conn.execute("BEGIN")
         try:
-            cursor.execute(
-                """
-            INSERT INTO trade_results (
-                timestamp, league, strategy_name, profit_per_flip, profit_per_hour_est,
-                profit_with_corruption_ev, risk_profile, liquidity_score, long_term
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    timestamp,
-                    league,
-                    r.strategy_name,
-                    r.profit_per_flip,
-                    r.profit_per_hour_est,
-                    r.profit_with_corruption_ev,
-                    r.risk_profile,
-                    r.liquidity_score,
-                    1 if r.long_term else 0,
-                ),
-            )
-            logged_count += 1
-        except sqlite3.IntegrityError:
-            duplicate_count += 1
-            logger.debug(
-                f"Duplicate entry for {r.strategy_name} at timestamp {timestamp} - skipping"
-            )
-
-    conn.commit()
-    conn.close()
+            conn.executemany(_INSERT_RESULT_SQL, rows)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        logged_count = conn.total_changes - changes_before
+    duplicate_count = len(rows) - logged_count
 
     if duplicate_count > 0:
         logger.warning(f"Skipped {duplicate_count} duplicate entries")
@@ -108,18 +155,27 @@ def log_results_to_db(results: list[AnalysisResult], league: str) -> None:
     log_database_operation("insert", logged_count)
 
 
-def get_historical_data(strategy_name: str, league: str) -> pd.DataFrame:
-    """Retrieves and formats historical data for a specific strategy from the database."""
+def get_historical_data(
+    strategy_name: str, league: str, limit: int | None = None
+) -> pd.DataFrame:
+    """
+    Retrieves and formats historical data for a specific strategy from the database.
+    If limit is given, only the most recent `limit` rows are read, still returned
+    in chronological order.
+    """
     if not get_database_path().exists():
         return pd.DataFrame()
 
-    conn = sqlite3.connect(get_database_path())
-    try:
+    conn = get_conn()
+    parse_dates = {"timestamp": {"unit": "s"}}
+    if limit is None:
         query = "SELECT * FROM trade_results WHERE strategy_name = ? AND league = ? ORDER BY timestamp"
-        df = pd.read_sql_query(query, conn, params=(strategy_name, league))
-    finally:
-        conn.close()
+        return pd.read_sql_query(
+            query, conn, params=(strategy_name, league), parse_dates=parse_dates
+        )
 
-    if not df.empty:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
-    return df
+    query = "SELECT * FROM trade_results WHERE strategy_name = ? AND league = ? ORDER BY timestamp DESC LIMIT ?"
+    df = pd.read_sql_query(
+        query, conn, params=(strategy_name, league, limit), parse_dates=parse_dates
+    )
+    return df.iloc[::-1].reset_index(drop=True)
@@ -5,10 +5,19 @@ Logging configuration and utilities for the Path of Exile trading analysis suite
 import logging
 import logging.handlers
 import sys
+import threading
 from pathlib import Path
 
 from .config import settings
 
+# colorlog is optional; probe for it once rather than on every setup
+try:
+    import colorlog
+
+    _HAS_COLORLOG = True
+except ImportError:
+    _HAS_COLORLOG = False
+
 
 def setup_logging() -> None:
     """
@@ -41,27 +50,22 @@ def setup_logging() -> None:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, console_config.get("level", "INFO")))
 
-        # Try to use colored logging if available
-        if console_config.get("colored", True):
-            try:
-                import colorlog
-
-                colored_formatter = colorlog.ColoredFormatter(
-                    "%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-                    datefmt=log_config.get("date_format", "%Y-%m-%d %H:%M:%S"),
-                    log_colors={
-                        "DEBUG": "cyan",
-                        "INFO": "green",
-                        "WARNING": "yellow",
-                        "ERROR": "red",
-                        "CRITICAL": "red,bg_white",
-                    },
-                )
-                console_handler.setFormatter(colored_formatter)
-            except ImportError:
-                # Fallback to regular formatter if colorlog not available
-                console_handler.setFormatter(formatter)
+        # Use colored logging if available
+        if console_config.get("colored", True) and _HAS_COLORLOG:
+            colored_formatter = colorlog.ColoredFormatter(
+                "%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                datefmt=log_config.get("date_format", "%Y-%m-%d %H:%M:%S"),
+                log_colors={
+                    "DEBUG": "cyan",
+                    "INFO": "green",
+                    "WARNING": "yellow",
+                    "ERROR": "red",
+                    "CRITICAL": "red,bg_white",
+                },
+            )
+            console_handler.setFormatter(colored_formatter)
         else:
+            # Fallback to regular formatter if colorlog not available or disabled
             console_handler.setFormatter(formatter)
 
         root_logger.addHandler(console_handler)
@@ -121,9 +125,9 @@ def log_api_request(
     logger = get_logger("poe_trade_lib.api")
 
     if error:
-        logger.error(f"API request failed: {url} - {error}")
+        logger.error("API request failed: %s - %s", url, error)
     else:
-        logger.debug(f"API request successful: {url} - Status: {status_code}")
+        logger.debug("API request successful: %s - Status: %s", url, status_code)
 
 
 def log_strategy_execution(
@@ -140,10 +144,10 @@ def log_strategy_execution(
     logger = get_logger("poe_trade_lib.strategies")
 
     if error:
-        logger.error(f"Strategy '{strategy_name}' failed: {error}")
+        logger.error("Strategy '%s' failed: %s", strategy_name, error)
     else:
         logger.info(
-            f"Strategy '{strategy_name}' completed - Found {result_count} results"
+            "Strategy '%s' completed - Found %s results", strategy_name, result_count
         )
 
 
@@ -161,9 +165,9 @@ def log_database_operation(
     logger = get_logger("poe_trade_lib.db_utils")
 
     if error:
-        logger.error(f"Database {operation} failed: {error}")
+        logger.error("Database %s failed: %s", operation, error)
     else:
-        logger.info(f"Database {operation} completed - {count} records affected")
+        logger.info("Database %s completed - %s records affected", operation, count)
 
 
 def log_data_acquisition(
@@ -179,19 +183,26 @@ def log_data_acquisition(
     """
     logger = get_logger("poe_trade_lib.api")
 
-    cache_status = "cache hit" if cache_hit else "API call"
     logger.debug(
-        f"Data acquisition ({cache_status}): {data_type} - {record_count} records"
+        "Data acquisition (%s): %s - %s records",
+        "cache hit" if cache_hit else "API call",
+        data_type,
+        record_count,
     )
 
 
-# Initialize logging when module is imported
+# Set once setup_logging() has run; library modules no longer configure logging
+# at import, so entry points (the apps and PoeAnalysisClient) trigger it
 _logging_initialized = False
+_logging_init_lock = threading.Lock()
 
 
 def ensure_logging_initialized() -> None:
     """Ensure logging is initialized exactly once."""
     global _logging_initialized
-    if not _logging_initialized:
-        setup_logging()
-        _logging_initialized = True
+    if _logging_initialized:
+        return
+    with _logging_init_lock:
+        if not _logging_initialized:
+            setup_logging()
+            _logging_initialized = True
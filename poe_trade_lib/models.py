@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """A standardized object for holding the result of a single trading strategy analysis."""
 
@@ -1,4 +1,13 @@
 # poe_trade_lib/strategies/__init__.py
+from .base_strategy import BaseStrategy
 from .flip_scarabs import ScarabByTypeStrategy, ScarabFullGambleStrategy
 from .flip_tattoos import TattooFlipStrategy
 from .invest_gems import GemLevelingStrategy
+
+# Every strategy run by core.run_all_analyses, in execution order
+STRATEGIES: tuple[type[BaseStrategy], ...] = (
+    GemLevelingStrategy,
+    ScarabByTypeStrategy,
+    ScarabFullGambleStrategy,
+    TattooFlipStrategy,
+)
@@ -1,11 +1,15 @@
 # poe_trade_lib/strategies/flip_scarabs.py
 
+import re
 
 from .. import utils
 from ..config import settings
 from ..models import AnalysisResult
 from .base_strategy import BaseStrategy
 
+# "<Type> Scarab ..." or "Scarab of <Type>"
+_SCARAB_TYPE_RE = re.compile(r"(\w+)\sScarab|Scarab\sof\s(\w+)")
+
 
 class ScarabFullGambleStrategy(BaseStrategy):
     """Analyzes the 3-to-1 recipe for ALL scarabs as a single pool (steady income)."""
@@ -19,9 +23,8 @@ class ScarabFullGambleStrategy(BaseStrategy):
         if scarab_df is None or scarab_df.empty:
             return []
 
-        cheapest_price = scarab_df["chaosValue"].min()
-        avg_return = scarab_df["chaosValue"].mean()
-        std_dev = scarab_df["chaosValue"].std()
+        stats = scarab_df["chaosValue"].agg(["min", "mean", "std"])
+        cheapest_price, avg_return, std_dev = stats["min"], stats["mean"], stats["std"]
         cost = 3 * cheapest_price
         profit = avg_return - cost
 
@@ -32,11 +35,9 @@ class ScarabFullGambleStrategy(BaseStrategy):
         shopping_list = scarab_df[scarab_df["chaosValue"] < avg_return / 3][
             "name"
         ].tolist()
-        num_jackpots = settings.get("analysis.num_jackpots_to_display", 5)
-        flips_per_hour = settings.get("analysis.assumed_flips_per_hour", 120)
-        jackpots = scarab_df.sort_values(by="chaosValue", ascending=False).head(
-            num_jackpots
-        )
+        num_jackpots = settings.analysis_num_jackpots
+        flips_per_hour = settings.analysis_flips_per_hour
+        jackpots = scarab_df.nlargest(num_jackpots, "chaosValue")
 
         result = AnalysisResult(
             strategy_name="Scarab: Full Gamble",
@@ -69,24 +70,15 @@ class ScarabByTypeStrategy(BaseStrategy):
         if scarab_df is None or scarab_df.empty:
             return []
 
-        df = scarab_df.copy()
-        extracted_types = df["name"].str.extract(r"(\w+)\sScarab|Scarab\sof\s(\w+)")
-        df["type"] = extracted_types[0].fillna(extracted_types[1])
-        df = df.dropna(subset=["type"])
-
-        type_analysis = (
-            df.groupby("type")["chaosValue"]
-            .agg(
-                cheapest_price="min",
-                average_return_ev="mean",
-                jackpot="max",
-                pool_size="count",
-                profit_volatility_std_dev="std",
-            )
-            .reset_index()
-            .fillna({"profit_volatility_std_dev": 0})
+        extracted_types = scarab_df["name"].str.extract(_SCARAB_TYPE_RE)
+        df = (
+            scarab_df[["name", "chaosValue"]]
+            .assign(type=extracted_types[0].fillna(extracted_types[1]))
+            .dropna(subset=["type"])
         )
 
+        type_analysis = utils.group_price_stats(df, "type")
+
         type_analysis["cost"] = 3 * type_analysis["cheapest_price"]
         type_analysis["profit_average_ev"] = (
             type_analysis["average_return_ev"] - type_analysis["cost"]
@@ -97,15 +89,23 @@ class ScarabByTypeStrategy(BaseStrategy):
         ]
 
         results = []
-        tolerance = settings.get("analysis.shopping_list_price_tolerance_chaos", 2.0)
-        flips_per_hour = settings.get("analysis.assumed_flips_per_hour", 120)
-
-        for _, row in profitable_types.iterrows():
+        tolerance = settings.analysis_price_tolerance
+        flips_per_hour = settings.analysis_flips_per_hour
+
+        # Build every shopping list in one pass: each item is compared with
+        # its own group's cheapest price instead of re-scanning per group
+        cheapest = type_analysis.set_index("type")["cheapest_price"]
+        within_budget = df["chaosValue"] <= df["type"].map(cheapest) + tolerance
+        shopping_lists = df[within_budget].groupby("type")["name"].apply(list).to_dict()
+
+        profitable_types = profitable_types.assign(
+            risk_profile=utils.get_risk_profile_array(
+                profitable_types["profit_volatility_std_dev"].to_numpy()
+            )
+        )
+        for row in profitable_types.to_dict("records"):
             scarab_type = row["type"]
-            shopping_list = df[
-                (df["type"] == scarab_type)
-                & (df["chaosValue"] <= row["cheapest_price"] + tolerance)
-            ]["name"].tolist()
+            shopping_list = shopping_lists.get(scarab_type, [])
             liquidity = (
                 row["cheapest_price"] / row["average_return_ev"]
                 if row["average_return_ev"] > 0
@@ -117,7 +117,7 @@ class ScarabByTypeStrategy(BaseStrategy):
                 profit_per_flip=row["profit_average_ev"],
                 input_cost=row["cheapest_price"],
                 volatility_std_dev=row["profit_volatility_std_dev"],
-                risk_profile=utils.get_risk_profile(row["profit_volatility_std_dev"]),
+                risk_profile=row["risk_profile"],
                 profit_per_hour_est=row["profit_average_ev"] * flips_per_hour,
                 liquidity_score=liquidity,
                 shopping_list=shopping_list,
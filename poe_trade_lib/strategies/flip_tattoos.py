@@ -1,11 +1,15 @@
 # poe_trade_lib/strategies/flip_tattoos.py
 
+import re
 
 from .. import utils
 from ..config import settings
 from ..models import AnalysisResult
 from .base_strategy import BaseStrategy
 
+# The tribe is the first word after " of the "
+_TRIBE_RE = re.compile(r" of the (\S+)")
+
 
 class TattooFlipStrategy(BaseStrategy):
     """Analyzes the 3-to-1 vendor recipe for Tattoos by tribe."""
@@ -19,24 +23,15 @@ class TattooFlipStrategy(BaseStrategy):
         if tattoo_df is None or tattoo_df.empty:
             return []
 
-        df = tattoo_df[~tattoo_df["name"].str.contains("Journey", na=False)].copy()
-        if not df["name"].str.contains(" of the ", na=False).any():
+        not_journey = ~tattoo_df["name"].str.contains("Journey", na=False)
+        df = tattoo_df.loc[not_journey, ["name", "chaosValue"]]
+        # Names without a tribe extract as NaN and are dropped
+        tribes = df["name"].str.extract(_TRIBE_RE, expand=False)
+        df = df.assign(tribe=tribes).dropna(subset=["tribe"])
+        if df.empty:
             return []
 
-        df["tribe"] = df["name"].apply(lambda x: x.split(" of the ")[1].split(" ")[0])
-
-        tribe_analysis = (
-            df.groupby("tribe")["chaosValue"]
-            .agg(
-                cheapest_price="min",
-                average_return_ev="mean",
-                jackpot="max",
-                pool_size="count",
-                profit_volatility_std_dev="std",
-            )
-            .reset_index()
-            .fillna({"profit_volatility_std_dev": 0})
-        )
+        tribe_analysis = utils.group_price_stats(df, "tribe")
 
         tribe_analysis["cost"] = 3 * tribe_analysis["cheapest_price"]
         tribe_analysis["profit_average_ev"] = (
@@ -46,15 +41,25 @@ class TattooFlipStrategy(BaseStrategy):
         profitable_tribes = tribe_analysis[tribe_analysis["profit_average_ev"] > 0]
 
         results = []
-        tolerance = settings.get("analysis.shopping_list_price_tolerance_chaos", 2.0)
-        flips_per_hour = settings.get("analysis.assumed_flips_per_hour", 120)
+        tolerance = settings.analysis_price_tolerance
+        flips_per_hour = settings.analysis_flips_per_hour
 
-        for _, row in profitable_tribes.iterrows():
+        # Build every shopping list in one pass: each item is compared with
+        # its own group's cheapest price instead of re-scanning per group
+        cheapest = tribe_analysis.set_index("tribe")["cheapest_price"]
+        within_budget = df["chaosValue"] <= df["tribe"].map(cheapest) + tolerance
+        shopping_lists = (
+            df[within_budget].groupby("tribe")["name"].apply(list).to_dict()
+        )
+
+        profitable_tribes = profitable_tribes.assign(
+            risk_profile=utils.get_risk_profile_array(
+                profitable_tribes["profit_volatility_std_dev"].to_numpy()
+            )
+        )
+        for row in profitable_tribes.to_dict("records"):
             tribe = row["tribe"]
-            shopping_list = df[
-                (df["tribe"] == tribe)
-                & (df["chaosValue"] <= row["cheapest_price"] + tolerance)
-            ]["name"].tolist()
+            shopping_list = shopping_lists.get(tribe, [])
             liquidity = (
                 row["cheapest_price"] / row["average_return_ev"]
                 if row["average_return_ev"] > 0
@@ -66,7 +71,7 @@ class TattooFlipStrategy(BaseStrategy):
                 profit_per_flip=row["profit_average_ev"],
                 input_cost=row["cheapest_price"],
                 volatility_std_dev=row["profit_volatility_std_dev"],
-                risk_profile=utils.get_risk_profile(row["profit_volatility_std_dev"]),
+                risk_profile=row["risk_profile"],
                 profit_per_hour_est=row["profit_average_ev"] * flips_per_hour,
                 liquidity_score=liquidity,
                 shopping_list=shopping_list,
@@ -1,17 +1,39 @@
 # poe_trade_lib/strategies/invest_gems.py
 
+import numpy as np
 import pandas as pd
 
 from .. import utils
 from ..config import settings
-from ..logging_config import ensure_logging_initialized, get_logger
+from ..logging_config import get_logger
 from ..models import AnalysisResult
 from .base_strategy import BaseStrategy
 
-# Initialize logging
-ensure_logging_initialized()
 logger = get_logger(__name__)
 
+# Gem listings the vendor recipe reads: the L1Q0 input, the L20Q20 product and
+# the corruption outcomes of the L20Q20
+_GEM_VARIANTS = ["l1q0", "l20q20", "l21q20", "l20q23", "l19q20"]
+# (level, quality, corrupted) of each variant above; quality -1 means none
+_VARIANT_SPECS = np.array(
+    [
+        (1, -1, False),  # starting input
+        (20, 20, False),  # final product
+        (21, 20, True),  # corruption outcomes
+        (20, 23, True),
+        (19, 20, True),
+    ],
+    dtype=np.float64,
+)
+
+
+def _variant_code(
+    level: np.ndarray, quality: np.ndarray, corrupted: np.ndarray
+) -> np.ndarray:
+    """Packs (level, quality, corrupted) element-wise into a single number."""
+    code: np.ndarray = (level * 100 + quality + 1) * 2 + corrupted
+    return code
+
 
 class GemLevelingStrategy(BaseStrategy):
     """
@@ -32,6 +54,12 @@ class GemLevelingStrategy(BaseStrategy):
         return "Gem Leveling & Corruption"
 
     def analyze(self, data_cache: dict, league: str) -> list[AnalysisResult]:
+        # Without corruption odds there is nothing to price, so bail out
+        # before touching any data
+        gem_probs = settings.get("strategies.gem_corruption.probabilities", {})
+        if not gem_probs:
+            return []
+
         gem_df = data_cache.get("Gem")
         currency_df = data_cache.get("Currency")
 
@@ -40,16 +68,16 @@ class GemLevelingStrategy(BaseStrategy):
             currency_df, pd.DataFrame
         ):
             return []
-        gem_probs = settings.get("strategies.gem_corruption.probabilities", {})
 
-        if any(df is None or df.empty for df in [gem_df, currency_df]) or not gem_probs:
+        if len(gem_df) == 0 or len(currency_df) == 0:
             return []
 
         try:
-            vaal_price = currency_df[currency_df["currencyTypeName"] == "Vaal Orb"][
-                "chaosEquivalent"
-            ].iloc[0]
-        except (IndexError, KeyError):
+            price_map = data_cache.get("CurrencyPriceMap")
+            if price_map is None:
+                price_map = utils.build_currency_price_map(currency_df)
+            vaal_price = price_map["Vaal Orb"]
+        except KeyError:
             logger.warning("Could not find Vaal Orb price. Skipping Gem strategy.")
             return []
 
@@ -63,7 +91,7 @@ class GemLevelingStrategy(BaseStrategy):
             return []
 
         results = []
-        for _, row in profitable_gems.head(15).iterrows():
+        for row in profitable_gems.head(15).to_dict("records"):
             result = AnalysisResult(
                 strategy_name=f"Gem Recipe: {row['name']}",
                 profit_per_flip=row["vendor_recipe_profit"],
@@ -81,8 +109,8 @@ class GemLevelingStrategy(BaseStrategy):
                     "Total Profit": row["total_profit"],
                     "L1Q0 Price": row["l1q0_price"],
                     "L20Q20 Price": row["l20q20_price"],
-                    "L21Q20 Price": row.get("l21q20_price", 0),
-                    "L20Q23 Price": row.get("l20q23_price", 0),
+                    "L21Q20 Price": row["l21q20_price"],
+                    "L20Q23 Price": row["l20q23_price"],
                 },
                 long_term=True,
                 profit_with_corruption_ev=row["total_profit"],
@@ -95,155 +123,109 @@ class GemLevelingStrategy(BaseStrategy):
     ) -> pd.DataFrame:
         """Find gems with complete vendor recipe chain and calculate profitability."""
 
-        # Filter out awakened gems (they don't follow normal vendor recipe)
-        regular_gems = gem_df[~gem_df["name"].str.contains("Awakened", na=False)]
-
-        # Get gem variants by level/quality
-        l1_q0_gems = regular_gems[
-            (regular_gems["gemLevel"] == 1)
-            & (regular_gems["gemQuality"].isna())
-            & ~regular_gems.get("corrupted", False)
-        ]
+        # One row per gem, one price column per variant
+        prices = self._pivot_gem_prices(gem_df)
 
-        l20_q20_gems = regular_gems[
-            (regular_gems["gemLevel"] == 20)
-            & (regular_gems["gemQuality"] == 20)
-            & ~regular_gems.get("corrupted", False)
-        ]
+        # Filter out awakened gems (they don't follow normal vendor recipe).
+        # Checked once per gem name rather than once per listing.
+        prices = prices[~prices.index.str.contains("Awakened", regex=False)]
 
-        # Find gems that have both L1Q0 and L20Q20 variants
-        l1_q0_names = set(l1_q0_gems["name"].unique())
-        l20_q20_names = set(l20_q20_gems["name"].unique())
-        viable_gems = l1_q0_names.intersection(l20_q20_names)
-
-        if not viable_gems:
+        # Keep gems that have both L1Q0 and L20Q20 variants
+        prices = prices.dropna(subset=["l1q0", "l20q20"])
+        if prices.empty:
             return pd.DataFrame()
 
-        # Calculate vendor recipe profitability
-        results = []
-        for gem_name in viable_gems:
-            gem_data = self._calculate_gem_recipe_profit(
-                gem_name, regular_gems, vaal_price, gem_probs
-            )
-            if gem_data and gem_data["total_profit"] > 10:  # Minimum profit threshold
-                results.append(gem_data)
-
-        if not results:
-            return pd.DataFrame()
-
-        return pd.DataFrame(results).sort_values("total_profit", ascending=False)
-
-    def _calculate_gem_recipe_profit(
-        self, gem_name: str, gem_df: pd.DataFrame, vaal_price: float, gem_probs: dict
-    ) -> dict | None:
-        """Calculate profit for a specific gem using vendor recipe strategy."""
-
-        # Get gem variants
-        gem_variants = gem_df[gem_df["name"] == gem_name]
-
-        # L1Q0 gems (starting input)
-        l1_q0 = gem_variants[
-            (gem_variants["gemLevel"] == 1)
-            & (gem_variants["gemQuality"].isna())
-            & ~gem_variants.get("corrupted", False)
-        ]
-
-        # L20Q20 gems (final product)
-        l20_q20 = gem_variants[
-            (gem_variants["gemLevel"] == 20)
-            & (gem_variants["gemQuality"] == 20)
-            & ~gem_variants.get("corrupted", False)
-        ]
-
-        # Corrupted variants for EV calculation
-        l21_q20 = gem_variants[
-            (gem_variants["gemLevel"] == 21)
-            & (gem_variants["gemQuality"] == 20)
-            & (gem_variants.get("corrupted", True))
-        ]
-
-        l20_q23 = gem_variants[
-            (gem_variants["gemLevel"] == 20)
-            & (gem_variants["gemQuality"] == 23)
-            & (gem_variants.get("corrupted", True))
-        ]
-
-        l19_q20 = gem_variants[
-            (gem_variants["gemLevel"] == 19)
-            & (gem_variants["gemQuality"] == 20)
-            & (gem_variants.get("corrupted", True))
-        ]
-
-        # Check if we have the required variants
-        if l1_q0.empty or l20_q20.empty:
-            return None
-
-        # Extract prices
-        l1_q0_price = l1_q0.iloc[0]["chaosValue"]
-        l20_q20_price = l20_q20.iloc[0]["chaosValue"]
-
-        # Calculate vendor recipe profit
-        total_input_cost = l1_q0_price * 3  # Need 3x L1Q0 gems
-        vendor_recipe_profit = l20_q20_price - total_input_cost
-
-        # Calculate corruption expected value
+        # Calculate vendor recipe profitability for every gem at once
+        total_input_cost = prices["l1q0"] * 3  # Need 3x L1Q0 gems
+        vendor_recipe_profit = prices["l20q20"] - total_input_cost
+        # Corruption probabilities of the L21Q20, L20Q23 and L19Q20 outcomes;
+        # the level change goes either way with equal odds. The no change
+        # outcome gains or loses nothing on gem value.
+        prob_level = gem_probs.get("level_change", 0) / 2
+        outcome_probs = (prob_level, gem_probs.get("quality_change", 0), prob_level)
         corruption_ev = self._calculate_corruption_ev(
-            l20_q20_price, l21_q20, l20_q23, l19_q20, vaal_price, gem_probs
+            prices["l20q20"].to_numpy(),
+            prices["l21q20"].to_numpy(),
+            prices["l20q23"].to_numpy(),
+            prices["l19q20"].to_numpy(),
+            vaal_price,
+            outcome_probs,
         )
+        opportunities = pd.DataFrame(
+            {
+                "name": prices.index,
+                "l1q0_price": prices["l1q0"],
+                "l20q20_price": prices["l20q20"],
+                "l21q20_price": prices["l21q20"].fillna(0),
+                "l20q23_price": prices["l20q23"].fillna(0),
+                "total_input_cost": total_input_cost,
+                "vendor_recipe_profit": vendor_recipe_profit,
+                "corruption_ev": corruption_ev,
+                "total_profit": vendor_recipe_profit + corruption_ev,
+            }
+        ).reset_index(drop=True)
+
+        # Minimum profit threshold
+        opportunities = opportunities[opportunities["total_profit"] > 10]
+        if opportunities.empty:
+            return pd.DataFrame()
 
-        total_profit = vendor_recipe_profit + corruption_ev
+        return opportunities.sort_values("total_profit", ascending=False)
+
+    def _pivot_gem_prices(self, gem_df: pd.DataFrame) -> pd.DataFrame:
+        """Pivot gem listings to one price column per recipe variant, indexed by name."""
+        level = gem_df["gemLevel"].to_numpy(np.float64)
+        quality = gem_df["gemQuality"].fillna(-1).to_numpy(np.float64)
+        if "corrupted" in gem_df.columns:
+            # poe.ninja omits the flag on uncorrupted gems, so missing means False.
+            # One pass yields a plain bool mask whatever the column's dtype.
+            corrupted = gem_df["corrupted"].eq(True).to_numpy(bool, na_value=False)
+            target_flags = _VARIANT_SPECS[:, 2]
+        else:
+            # Without the flag the corruption state cannot be checked either way
+            corrupted = np.zeros(len(gem_df), dtype=bool)
+            target_flags = np.zeros(len(_VARIANT_SPECS))
+        targets = _variant_code(
+            _VARIANT_SPECS[:, 0], _VARIANT_SPECS[:, 1], target_flags
+        )
 
-        return {
-            "name": gem_name,
-            "l1q0_price": l1_q0_price,
-            "l20q20_price": l20_q20_price,
-            "l21q20_price": l21_q20.iloc[0]["chaosValue"] if not l21_q20.empty else 0,
-            "l20q23_price": l20_q23.iloc[0]["chaosValue"] if not l20_q23.empty else 0,
-            "total_input_cost": total_input_cost,
-            "vendor_recipe_profit": vendor_recipe_profit,
-            "corruption_ev": corruption_ev,
-            "total_profit": total_profit,
-        }
+        # One code per listing, so each variant is a single comparison rather
+        # than three; a missing level codes as NaN and matches nothing
+        code = _variant_code(level, quality, corrupted)
+        variant = np.select([code == t for t in targets], _GEM_VARIANTS, default="")
+        # Only the two columns the pivot reads are sliced, not the whole listing
+        is_variant = variant != ""
+        variants = gem_df.loc[is_variant, ["name", "chaosValue"]].assign(
+            variant=variant[is_variant]
+        )
+        # The first priced listing of each (name, variant) is the price used.
+        # Deduplicating first lets pivot place each price by a hashed index
+        # lookup instead of running a groupby aggregation per cell.
+        prices: pd.DataFrame = (
+            variants.dropna(subset=["chaosValue"])
+            .drop_duplicates(subset=["name", "variant"])
+            .pivot(index="name", columns="variant", values="chaosValue")
+            .sort_index()
+        )
+        return prices.reindex(columns=_GEM_VARIANTS)
 
     def _calculate_corruption_ev(
         self,
-        base_price: float,
-        l21_q20: pd.DataFrame,
-        l20_q23: pd.DataFrame,
-        l19_q20: pd.DataFrame,
+        base: np.ndarray,
+        l21: np.ndarray,
+        l23: np.ndarray,
+        l19: np.ndarray,
         vaal_price: float,
-        gem_probs: dict,
-    ) -> float:
-        """Calculate expected value from corrupting a L20Q20 gem."""
-
-        # Corruption probabilities
-        prob_plus_lvl = gem_probs.get("level_change", 0) / 2  # +1 level
-        prob_minus_lvl = gem_probs.get("level_change", 0) / 2  # -1 level
-        prob_qual = gem_probs.get("quality_change", 0)  # +3 quality
-        prob_no_change = gem_probs.get("no_change", 0)  # No change
-
-        # Expected value calculation
-        ev_gain: float = 0
-
-        # L21Q20 outcome
-        if not l21_q20.empty:
-            l21_price = l21_q20.iloc[0]["chaosValue"]
-            ev_gain += prob_plus_lvl * (l21_price - base_price)
-
-        # L20Q23 outcome
-        if not l20_q23.empty:
-            l20_q23_price = l20_q23.iloc[0]["chaosValue"]
-            ev_gain += prob_qual * (l20_q23_price - base_price)
-
-        # L19Q20 outcome (loss)
-        if not l19_q20.empty:
-            l19_price = l19_q20.iloc[0]["chaosValue"]
-            ev_gain += prob_minus_lvl * (l19_price - base_price)
+        outcome_probs: tuple[float, float, float],
+    ) -> np.ndarray:
+        """Calculate expected value from corrupting each gem's L20Q20 variant."""
 
-        # No change outcome (no gain/loss on gem value)
-        ev_gain += prob_no_change * 0
+        # One row per outcome (L21Q20, L20Q23, L19Q20), one column per gem;
+        # outcomes with no listed price are NaN and contribute nothing
+        weights = np.array(outcome_probs)[:, np.newaxis]
+        ev_gain = np.nansum(weights * (np.stack([l21, l23, l19]) - base), axis=0)
 
         # Subtract vaal orb cost
-        corruption_ev = ev_gain - vaal_price
+        corruption_ev: np.ndarray = ev_gain - vaal_price
 
         return corruption_ev
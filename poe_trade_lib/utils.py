@@ -1,32 +1,58 @@
 # poe_trade_lib/utils.py
 from __future__ import annotations
 
+import bisect
 import json
+import math
 from urllib.parse import quote
 
 import numpy as np
+import pandas as pd
 
 from .config import settings
 
-DIVINE_TO_CHAOS = 200
+DIVINE_TO_CHAOS: float = 200
+
+# Checked against on every format_currency call, so built once
+_NUMERIC_TYPES: tuple[type, ...] = (int, float, np.number)
+_FLOAT_TYPES = (float, np.floating)
+
+# Risk thresholds in ascending order, with "Extreme" for anything above them
+_RISK_THRESHOLDS = tuple(
+    threshold for _, threshold in settings.analysis_risk_thresholds
+)
+_RISK_PROFILES = np.array(
+    [profile for profile, _ in settings.analysis_risk_thresholds] + ["Extreme"]
+)
 
 
 def format_currency(chaos_value: float) -> str:
     """Formats a chaos value into a readable string."""
-    if not isinstance(chaos_value, int | float | np.number) or np.isnan(chaos_value):
+    if not isinstance(chaos_value, _NUMERIC_TYPES):
+        return "N/A"
+    # Only floats can be NaN; integers skip the check entirely
+    if isinstance(chaos_value, _FLOAT_TYPES) and math.isnan(chaos_value):
         return "N/A"
     if abs(chaos_value) >= DIVINE_TO_CHAOS:
         return f"{chaos_value / DIVINE_TO_CHAOS:.2f} div"
     return f"{chaos_value:.1f}c"
 
 
+def format_currency_array(chaos_values: np.ndarray) -> np.ndarray:
+    """Formats an array of chaos values like format_currency, one pass per unit."""
+    values = np.asarray(chaos_values, dtype=np.float64)
+    formatted = np.where(
+        np.abs(values) >= DIVINE_TO_CHAOS,
+        np.char.mod("%.2f div", values / DIVINE_TO_CHAOS),
+        np.char.mod("%.1fc", values),
+    )
+    return np.where(np.isnan(values), "N/A", formatted)
+
+
 def generate_bulk_trade_url(
     item_names_list: list, league: str, currency_to_have: str = "chaos"
 ) -> str:
     """Generates a clickable PoE trade URL for bulk item exchange."""
-    trade_url_base = settings.get(
-        "api.trade_url_base", "https://www.pathofexile.com/trade/exchange/"
-    )
     if not item_names_list:
         return "N/A"
     query = {
@@ -36,18 +62,76 @@ def generate_bulk_trade_url(
             "want": item_names_list,
         }
     }
-    encoded_query = quote(json.dumps(query))
-    return f"{trade_url_base}{league}?q={encoded_query}"
+    # Compact separators keep whitespace out of the URL; the query is one
+    # component, so "/" is escaped too
+    encoded_query = quote(json.dumps(query, separators=(",", ":")), safe="")
+    return f"{settings.api_trade_url_base}{league}?q={encoded_query}"
 
 
 def get_risk_profile(std_dev: float) -> str:
     """Assigns a risk profile string based on profit volatility."""
-    risk_thresholds: dict[str, float] = settings.get(
-        "analysis.profit_volatility_risk_thresholds", {}
-    )
     if np.isnan(std_dev) or std_dev == 0:
         return "None"
-    for profile, threshold in sorted(risk_thresholds.items(), key=lambda item: item[1]):
-        if std_dev <= threshold:
-            return profile
-    return "Extreme"
+    # First profile whose threshold is at least std_dev
+    return str(_RISK_PROFILES[bisect.bisect_left(_RISK_THRESHOLDS, std_dev)])
+
+
+def get_risk_profile_array(std_devs: np.ndarray) -> np.ndarray:
+    """Assigns risk profiles like get_risk_profile, for a whole array at once."""
+    values = np.asarray(std_devs, dtype=np.float64)
+    profiles = _RISK_PROFILES[np.searchsorted(_RISK_THRESHOLDS, values, side="left")]
+    return np.where(np.isnan(values) | (values == 0), "None", profiles)
+
+
+def build_currency_price_map(currency_df: pd.DataFrame) -> dict[str, float]:
+    """Maps each currency name to its chaos equivalent for O(1) price lookups."""
+    return dict(
+        zip(
+            currency_df["currencyTypeName"].to_numpy(),
+            currency_df["chaosEquivalent"].to_numpy(),
+            strict=True,
+        )
+    )
+
+
+def group_price_stats(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """
+    Per-group chaosValue min/mean/max/count/std for the 3-to-1 recipe strategies.
+
+    Computes all five statistics in one vectorized sweep over integer group
+    codes instead of one pandas aggregation pass each. Like pandas, NaN prices
+    are skipped and groups come back sorted by key; a single-item group has a
+    standard deviation of 0.
+    """
+    codes, groups = pd.factorize(df[key], sort=True)
+    values = df["chaosValue"].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    n_groups = len(groups)
+
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    mins = np.full(n_groups, np.inf)
+    maxs = np.full(n_groups, -np.inf)
+    np.minimum.at(mins, codes, values)
+    np.maximum.at(maxs, codes, values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        # Two-pass variance: squared deviations from each group's own mean
+        sq_dev = np.bincount(
+            codes, weights=(values - means[codes]) ** 2, minlength=n_groups
+        )
+        std = np.sqrt(sq_dev / (counts - 1))
+    empty = counts == 0
+    mins[empty] = maxs[empty] = np.nan
+
+    return pd.DataFrame(
+        {
+            key: groups,
+            "cheapest_price": mins,
+            "average_return_ev": means,
+            "jackpot": maxs,
+            "pool_size": counts,
+            "profit_volatility_std_dev": np.where(counts > 1, std, 0.0),
+        }
+    )